@@ -1,4 +1,7 @@
-from typing import Optional, Dict, Type
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Type, Tuple, Any
 from .smshub import SMSHubClient
 from .herosms import HeroSMSClient
 from .smsactivate import SMSActivateClient
@@ -27,6 +30,20 @@ class PyHub:
         "smsbower": "smsbower",
     }
 
+    # Single alternation with one named group per provider key
+    _URL_RE = re.compile(
+        "|".join(f"(?P<{key}>{re.escape(pattern)})" for pattern, key in _url_patterns.items())
+    )
+
+    # Characters ignored when normalizing provider names
+    _NORM_TABLE = str.maketrans("", "", "-_ ")
+
+    # Memoized clients keyed on (class, api_key, proxy, timeout, kwargs), in LRU order
+    _clients: "OrderedDict[Tuple[Any, ...], ClientBase]" = OrderedDict()
+    _max_clients = 32
+    # Guards _clients; get_client is typically called from several handler threads
+    _clients_lock = threading.Lock()
+
     @classmethod
     def get_client(
         cls,
@@ -43,26 +60,32 @@ class PyHub:
         Args:
             api_key: API key for the service
             provider: Optional name of the provider (smshub, herosms, smsactivate)
-            base_url: Optional base URL (used to identify provider if name is missing)
+            base_url: Optional base URL (used to identify provider if name is missing;
+                unknown URLs raise ValueError unless provider is given)
             proxy: Optional proxy string
             timeout: Request timeout in seconds
             **kwargs: Additional arguments
+
+        Clients are memoized: identical arguments return the same instance,
+        so its connection pool and cache are shared between callers and any
+        mutation of the returned client is visible to all of them. close()
+        is reference-counted per get_client call, so using the client as a
+        context manager only closes the pool once every holder released it:
+
+            with PyHub.get_client(provider="smshub", api_key="KEY") as client:
+                client.get_balance()
         """
         # 1. Identify provider key
         provider_key = None
         
         if provider:
-            provider_key = provider.lower().replace("-", "").replace("_", "").strip()
+            provider_key = provider.lower().translate(cls._NORM_TABLE)
         elif base_url:
             # Detect provider by URL pattern
-            url_lower = base_url.lower()
-            for pattern, key in cls._url_patterns.items():
-                if pattern in url_lower:
-                    provider_key = key
-                    break
-            else:
-                if not provider_key:
-                    provider_key = "smshub"
+            m = cls._URL_RE.search(base_url.lower())
+            if not m:
+                raise ValueError(f"Unknown provider URL: {base_url}")
+            provider_key = m.lastgroup
         
         if not provider_key:
             raise ValueError(
@@ -84,12 +107,33 @@ class PyHub:
         if base_url:
             kwargs["base_url"] = base_url
 
-        return client_class(
-            api_key=api_key, 
-            proxy=proxy, 
-            timeout=timeout, 
-            **kwargs
-        )
+        kwargs_items = tuple(sorted(kwargs.items()))
+        try:
+            hash(kwargs_items)
+        except TypeError:
+            # Unhashable extra arguments cannot be memoized
+            return client_class(api_key=api_key, proxy=proxy, timeout=timeout, **kwargs)
+
+        key = (client_class, api_key, proxy, timeout, kwargs_items)
+        with cls._clients_lock:
+            client = cls._clients.get(key)
+            if client is not None and client._acquire() is not None:
+                cls._clients.move_to_end(key)
+                return client
+
+            client = client_class(api_key=api_key, proxy=proxy, timeout=timeout, **kwargs)
+            cls._clients[key] = client
+            cls._clients.move_to_end(key)
+            while len(cls._clients) > cls._max_clients:
+                # Only forget the entry; holders still own it and close() it themselves
+                cls._clients.popitem(last=False)
+            return client
+
+    @classmethod
+    def clear_clients(cls) -> None:
+        """Forget all memoized clients (they are not closed)."""
+        with cls._clients_lock:
+            cls._clients.clear()
 
 
 __all__ = [
@@ -1,3 +1,4 @@
 from .client import ClientBase
+from .async_client import AsyncClientBase
 
-__all__ = ["ClientBase"]
+__all__ = ["ClientBase", "AsyncClientBase"]
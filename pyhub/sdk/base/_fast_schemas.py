@@ -0,0 +1,65 @@
+import copy
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Protocol, Union
+from pydantic import BaseModel
+from .schemas import ServicePrice, CountryPrices
+
+
+class _ToPydantic(Protocol):
+    """Rows that can convert themselves into their validated pydantic model."""
+
+    def to_pydantic(self) -> BaseModel: ...
+
+
+class _PydanticCompat:
+    """
+    The subset of the pydantic BaseModel API callers use on price rows.
+
+    Subclasses must be dataclasses implementing _ToPydantic.
+    isinstance(row, CountryPrices) is still False; call to_pydantic() (or
+    pass strict=True to the price methods) when a real model is required.
+    """
+
+    __slots__ = ()
+
+    def model_dump(self: _ToPydantic, **kwargs: Any) -> Dict[str, Any]:
+        if kwargs:
+            # include/exclude/by_alias/... are handled by pydantic itself
+            return self.to_pydantic().model_dump(**kwargs)
+        return asdict(self)  # type: ignore[call-overload]
+
+    def model_dump_json(self: _ToPydantic, **kwargs: Any) -> str:
+        return self.to_pydantic().model_dump_json(**kwargs)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> Any:
+        copied = copy.deepcopy(self) if deep else copy.copy(self)
+        for name, value in (update or {}).items():
+            setattr(copied, name, value)
+        return copied
+
+
+@dataclass(slots=True)
+class FastServicePrice(_PydanticCompat):
+    """Unvalidated, slotted mirror of ServicePrice used by the price parsers."""
+    service: str
+    cost: Union[float, List[float]]
+    min_price: float
+    max_price: float
+    count: int
+
+    def to_pydantic(self) -> ServicePrice:
+        return ServicePrice.from_fast(self)
+
+
+@dataclass(slots=True)
+class FastCountryPrices(_PydanticCompat):
+    """Unvalidated, slotted mirror of CountryPrices used by the price parsers."""
+    country_id: int
+    services: Dict[str, FastServicePrice]
+
+    def to_pydantic(self) -> CountryPrices:
+        return CountryPrices.from_fast(self)
+
+
+# Price methods return the fast mirrors, or pydantic models when strict=True
+CountryPricesLike = Union[FastCountryPrices, CountryPrices]
@@ -0,0 +1,144 @@
+import asyncio
+import httpx
+from typing import Optional, Dict, Any, List
+from .schemas import Balance, NumberActivation, ActivationStatus
+from .client import (
+    _client_kwargs,
+    _build_query,
+    _check_response,
+    _parse_balance,
+    _number_params,
+    _parse_access_number,
+    _parse_status,
+    _sms_code,
+)
+from loguru import logger
+
+
+class AsyncClientBase:
+    """
+    Async counterpart of ClientBase for SMSHub-like APIs.
+
+    Requests share one pooled httpx.AsyncClient and at most
+    ``max_concurrency`` of them are in flight at the same time.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        proxy: Optional[str] = None,
+        timeout: int = 30,
+        max_concurrency: int = 20,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        # Parsed once; httpx would otherwise re-parse the string on every request
+        self._url = httpx.URL(self.base_url)
+        self.proxy = proxy
+        self.timeout = timeout
+
+        self.client_kwargs = _client_kwargs(self.timeout, self.proxy, max_connections=max_concurrency)
+
+        self._action_bases: Dict[str, Dict[str, Any]] = {}
+
+        self._http = httpx.AsyncClient(**self.client_kwargs)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncClientBase":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _request(self, action: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Generic request method for SMSHub API actions.
+        """
+        query_params = _build_query(self._action_bases, self.api_key, action, params)
+
+        logger.opt(lazy=True).debug("Query: {} URL: {}", lambda: query_params, lambda: self.base_url)
+
+        async with self._semaphore:
+            response = await self._http.get(self._url, params=query_params)
+        response.raise_for_status()
+        text = response.text
+
+        logger.opt(lazy=True).debug("URL Full: {}", lambda: response.url)
+
+        logger.opt(lazy=True).debug("Response: {}", lambda: text)
+
+        return _check_response(text)
+
+    async def get_balance(self) -> Balance:
+        """Get account balance."""
+        return _parse_balance(await self._request("getBalance"))
+
+    async def get_number(
+        self,
+        service: str,
+        country: Optional[int] = None,
+        operator: Optional[str] = None,
+        max_price: Optional[str] = None,
+    ) -> NumberActivation:
+        """Order a number for a service."""
+        params = _number_params(service, country, operator, max_price)
+        response = await self._request("getNumber", params=params)
+        parsed = _parse_access_number(response)
+        if parsed:
+            return NumberActivation.model_construct(
+                activation_id=parsed[0],
+                phone_number=parsed[1],
+                service=service
+            )
+        raise ValueError(f"Error getting number: {response}")
+
+    async def set_status(self, activation_id: str, status: int) -> str:
+        """Set activation status. See ClientBase.set_status for codes."""
+        params = {"id": activation_id, "status": status}
+        return await self._request("setStatus", params=params)
+
+    async def active_status(self, activation_id: str) -> str:
+        """Shortcut to set status to 1 (ready)."""
+        return await self.set_status(activation_id, 1)
+
+    async def reactivation_number(self, activation_id: str) -> NumberActivation:
+        """
+        Request reactivation of a previously used number.
+        Action: getExtraActivation
+        """
+        params = {"activationId": activation_id}
+        response = await self._request("getExtraActivation", params=params)
+
+        parsed = _parse_access_number(response)
+        if parsed:
+            new_id, new_number = parsed
+
+            await self.active_status(new_id)
+
+            return NumberActivation.model_construct(
+                activation_id=new_id,
+                phone_number=new_number,
+                service="reactivation"
+            )
+        raise ValueError(f"Error reactivating number: {response}")
+
+    async def get_status(self, activation_id: str) -> ActivationStatus:
+        """Get activation status and SMS code."""
+        params = {"id": activation_id}
+        return _parse_status(await self._request("getStatus", params=params))
+
+    async def get_status_many(self, ids: List[str]) -> List[ActivationStatus]:
+        """
+        Get the status of several activations concurrently.
+        Results are returned in the same order as ``ids``.
+        """
+        return list(await asyncio.gather(*(self.get_status(i) for i in ids)))
+
+    async def get_sms(self, activation_id: str) -> Optional[str]:
+        """Return the SMS code if it has arrived, None otherwise."""
+        return _sms_code(await self.get_status(activation_id))
@@ -0,0 +1,137 @@
+import copy
+import inspect
+import threading
+import time
+import functools
+import httpx
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from loguru import logger
+
+# TTL policies (seconds) for cached endpoints
+SHORT_TTL = 5
+NORMAL_TTL = 30
+LONG_TTL = 60
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small LRU cache whose entries expire after a per-entry TTL.
+
+    Expired entries are kept (until evicted) so they can still be served
+    as a stale fallback when the API is unreachable. Safe to share between
+    threads.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh value for key, or default if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return default
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def get_stale(self, key: Hashable, default: Any = None, max_stale: float = float("inf")) -> Any:
+        """Return the last stored value for key if it expired at most max_stale seconds ago."""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or time.monotonic() - entry[0] > max_stale:
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Drop key (fresh or stale) if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def cached(
+    ttl: float = NORMAL_TTL,
+    max_stale: Optional[float] = None,
+    derive: Optional[Callable[..., Any]] = None,
+) -> Callable[[F], F]:
+    """
+    Cache a client method's result in ``self._cache`` for ``ttl`` seconds.
+
+    The key is the method name plus its arguments bound to the signature
+    with defaults applied, so ``f()``, ``f(None)`` and ``f(x=None)`` share
+    one entry; ``method.cache_key(*args, **kwargs)`` rebuilds it.
+
+    On a miss, ``derive(self, **arguments)`` may answer from other cached
+    data; a non-None result is returned as is and not stored, so it never
+    outlives the entry it came from.
+
+    On httpx.HTTPError the last value is returned if it expired at most
+    ``max_stale`` seconds ago (default: 3 * ttl), otherwise the error is
+    re-raised. Callers get a shallow copy, so replacing items in a returned
+    list does not affect the cache (or other holders of a shared client);
+    the row objects themselves are still shared.
+    """
+    stale_window = 3 * ttl if max_stale is None else max_stale
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        def bind(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            bound = signature.bind(None, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            return arguments
+
+        def make_key(arguments: Dict[str, Any]) -> Hashable:
+            return (func.__name__, tuple(arguments.items()))
+
+        @functools.wraps(func)
+        def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            arguments = bind(args, kwargs)
+            key = make_key(arguments)
+            value = self._cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return copy.copy(value)
+
+            if derive is not None:
+                derived = derive(self, **arguments)
+                if derived is not None:
+                    return derived
+
+            try:
+                value = func(self, *args, **kwargs)
+            except httpx.HTTPError as e:
+                stale = self._cache.get_stale(key, _MISSING, max_stale=stale_window)
+                if stale is _MISSING:
+                    raise
+                logger.warning(f"Serving stale {func.__name__} result after HTTP error: {e}")
+                return copy.copy(stale)
+
+            self._cache.set(key, value, ttl)
+            return copy.copy(value)
+
+        wrapper.cache_key = lambda *args, **kwargs: make_key(bind(args, kwargs))  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -1,9 +1,130 @@
 import httpx
+import io
 import re
-from typing import Optional, Dict, Any, List, Union
+import sys
+import threading
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+try:
+    import ijson as _ijson
+except ImportError:
+    _ijson = None
+
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Union, Iterator, Tuple
 from .schemas import Balance, NumberActivation, ActivationStatus, ServicePrice, CountryPrices
+from ._fast_schemas import FastServicePrice, FastCountryPrices, CountryPricesLike
+from .cache import TTLCache, cached, SHORT_TTL, NORMAL_TTL, LONG_TTL
 from loguru import logger
 
+# Bare error codes returned by SMSHub-like APIs
+_ERROR_RE = re.compile(r"\b(?:BAD_KEY|ERROR_SQL|BAD_ACTION|WRONG_ACTIVATION_ID|NO_KEY|BANNED)\b")
+# ACCESS_NUMBER:ID:NUMBER
+_ACCESS_NUMBER_RE = re.compile(r"^ACCESS_NUMBER:([^:]+):(.+)$")
+# Interned status tokens checked while polling
+_STATUS_OK = sys.intern("STATUS_OK")
+_TERMINAL_STATUSES = frozenset(map(sys.intern, ("STATUS_CANCEL", "NO_ACTIVATION", "ACCESS_CANCEL")))
+# getPrices payloads above this size are stream-parsed when ijson is installed
+_STREAM_THRESHOLD = 256_000
+
+
+# Sync/async-neutral helpers shared by ClientBase and AsyncClientBase
+
+def _client_kwargs(timeout: int, proxy: Optional[str], max_connections: int) -> Dict[str, Any]:
+    """httpx.Client/AsyncClient keyword arguments."""
+    kwargs: Dict[str, Any] = {
+        "timeout": timeout,
+        "follow_redirects": True,
+        "headers": {"User-Agent": "pyhub-sdk"},
+        # HTTP/2 multiplexes concurrent requests to the provider over one connection
+        "http2": True,
+        "limits": httpx.Limits(
+            max_keepalive_connections=max_connections,
+            max_connections=max_connections,
+            keepalive_expiry=30.0,
+        ),
+    }
+    if proxy:
+        kwargs["proxy"] = proxy
+    return kwargs
+
+
+def _build_query(
+    action_bases: Dict[str, Dict[str, Any]],
+    api_key: str,
+    action: str,
+    params: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Query params for an action, reusing the fixed {"api_key", "action"} part per action."""
+    base = action_bases.get(action)
+    if base is None:
+        base = action_bases[action] = {"api_key": api_key, "action": action}
+    return {**base, **params} if params else base
+
+
+def _check_response(text: str) -> str:
+    """Raise ValueError on the common SMSHub/HeroSMS/SMSActivate error codes."""
+    # JSON payloads never carry these bare error codes, so skip the scan.
+    if not text.startswith(("{", "[")) and _ERROR_RE.search(text):
+        raise ValueError(f"API Error: {text}")
+    return text
+
+
+def _parse_balance(response: str) -> Balance:
+    # Expected: ACCESS_BALANCE:123.45
+    if ":" in response:
+        return Balance(amount=float(response.split(":")[1]))
+    raise ValueError(f"Unexpected balance response: {response}")
+
+
+def _number_params(
+    service: str,
+    country: Optional[int],
+    operator: Optional[str],
+    max_price: Optional[str],
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"service": service}
+    if country is not None:
+        params["country"] = country
+    if operator:
+        if country != None and country != 73:
+            operator = "any"
+        params["operator"] = operator
+
+    if max_price:
+        params["maxPrice"] = max_price
+    return params
+
+
+def _parse_access_number(response: str) -> Optional[Tuple[str, str]]:
+    """(activation_id, phone_number) from ACCESS_NUMBER:ID:NUMBER, else None."""
+    m = _ACCESS_NUMBER_RE.match(response)
+    return (m[1], m[2]) if m else None
+
+
+def _parse_status(response: str) -> ActivationStatus:
+    # Expected: STATUS_WAIT_CODE, STATUS_OK:CODE, STATUS_CANCEL, etc.
+    if ":" in response:
+        status, code = response.split(":", 1)
+        return ActivationStatus(status=sys.intern(status), code=code)
+
+    return ActivationStatus(status=sys.intern(response))
+
+
+def _sms_code(status: ActivationStatus) -> Optional[str]:
+    """SMS code once the activation is STATUS_OK, None while waiting or when finished."""
+    if status.status == _STATUS_OK:
+        return status.code
+
+    # If status indicates it's finished or cancelled, stop polling
+    if status.status in _TERMINAL_STATUSES:
+        return None
+
+
 class ClientBase:
     """
     Base generic client for SMSHub-like APIs.
@@ -18,58 +139,79 @@ class ClientBase:
     ):
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
+        # Parsed once; httpx would otherwise re-parse the string on every request
+        self._url = httpx.URL(self.base_url)
         self.proxy = proxy
         self.timeout = timeout
 
-        self.client_kwargs: Dict[str, Any] = {
-            "timeout": self.timeout,
-            "follow_redirects": True,
-        }
+        self.client_kwargs = _client_kwargs(self.timeout, self.proxy, max_connections=20)
+
+        self._action_bases: Dict[str, Dict[str, Any]] = {}
+
+        # Persistent client so keep-alive connections are reused across calls
+        self._http = httpx.Client(**self.client_kwargs)
+        # Holders sharing this instance (see PyHub.get_client); close() releases one
+        self._refs = 1
+        self._refs_lock = threading.Lock()
+        # Per-instance TTL cache for slow-changing endpoints (see @cached)
+        self._cache = TTLCache(128)
+
+    def close(self) -> None:
+        """
+        Release this holder's reference and close the HTTP connection pool
+        once no holder is left.
+        """
+        with self._refs_lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+        self._http.close()
+
+    def _acquire(self) -> Optional["ClientBase"]:
+        """Register one more holder of a shared instance, or None if it was already released."""
+        with self._refs_lock:
+            if self._refs <= 0 or self.closed:
+                return None
+            self._refs += 1
+            return self
+
+    @property
+    def closed(self) -> bool:
+        """Whether the underlying HTTP connection pool has been closed."""
+        return self._http.is_closed
 
-        if self.proxy:
-            self.client_kwargs["proxy"] = self.proxy
+    def __enter__(self) -> "ClientBase":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _request(self, action: str, params: Optional[Dict[str, Any]] = None) -> str:
         """
         Generic request method for SMSHub API actions.
         """
-        if params is None:
-            params = {}
-
-        query_params = {
-            "api_key": self.api_key,
-            "action": action,
-            **params
-        }
-        
-        logger.debug(f"Query: {query_params} URL: {self.base_url}")
+        query_params = _build_query(self._action_bases, self.api_key, action, params)
 
-        with httpx.Client(**self.client_kwargs) as client:
-            response = client.get(self.base_url, params=query_params)
-            response.raise_for_status()
-            text = response.text
-            
-            
-            logger.debug(f"URL Full: {response.url}")
-            
-            logger.debug(f"Response: {text}")
-            
-            # Common error checks for SMSHub/HeroSMS/SMSActivate
-            errors = ["BAD_KEY", "ERROR_SQL", "BAD_ACTION", "WRONG_ACTIVATION_ID", "NO_KEY", "BANNED"]
-            for err in errors:
-                if err in text:
-                    raise ValueError(f"API Error: {text}")
-                    
-            return text
+        logger.opt(lazy=True).debug("Query: {} URL: {}", lambda: query_params, lambda: self.base_url)
+
+        response = self._http.get(self._url, params=query_params)
+        response.raise_for_status()
+        text = response.text
+
+        logger.opt(lazy=True).debug("URL Full: {}", lambda: response.url)
 
+        logger.opt(lazy=True).debug("Response: {}", lambda: text)
+
+        return _check_response(text)
+
+    @cached(ttl=SHORT_TTL)
     def get_balance(self) -> Balance:
         """Get account balance."""
-        response = self._request("getBalance")
-        # Expected: ACCESS_BALANCE:123.45
-        if ":" in response:
-            amount = float(response.split(":")[1])
-            return Balance(amount=amount)
-        raise ValueError(f"Unexpected balance response: {response}")
+        return _parse_balance(self._request("getBalance"))
+
+    def _forget_balance(self) -> None:
+        """Drop the cached balance after calls that spend or refund money."""
+        self._cache.discard(ClientBase.get_balance.cache_key())
 
     def get_number(
         self, 
@@ -79,24 +221,14 @@ class ClientBase:
         max_price: Optional[str] = None,
     ) -> NumberActivation:
         """Order a number for a service."""
-        params = {"service": service}
-        if country is not None:
-            params["country"] = country
-        if operator:
-            if country != None and country != 73:
-                operator = "any"
-            params["operator"] = operator
-
-        if max_price:
-            params["maxPrice"] = max_price
-            
+        params = _number_params(service, country, operator, max_price)
         response = self._request("getNumber", params=params)
-        # Expected: ACCESS_NUMBER:ID:NUMBER
-        if response.startswith("ACCESS_NUMBER"):
-            parts = response.split(":")
-            return NumberActivation(
-                activation_id=parts[1],
-                phone_number=parts[2],
+        self._forget_balance()
+        parsed = _parse_access_number(response)
+        if parsed:
+            return NumberActivation.model_construct(
+                activation_id=parsed[0],
+                phone_number=parsed[1],
                 service=service
             )
         raise ValueError(f"Error getting number: {response}")
@@ -110,7 +242,10 @@ class ClientBase:
             8 — cancel activation (return money)
         """
         params = {"id": activation_id, "status": status}
-        return self._request("setStatus", params=params)
+        response = self._request("setStatus", params=params)
+        # Cancelling (8) refunds and completing (6) settles the activation
+        self._forget_balance()
+        return response
 
     def active_status(self, activation_id: str) -> str:
         """Shortcut to set status to 1 (ready)."""
@@ -123,17 +258,16 @@ class ClientBase:
         """
         params = {"activationId": activation_id}
         response = self._request("getExtraActivation", params=params)
+        self._forget_balance()
         
-        # Expected: ACCESS_NUMBER:ID:NUMBER
-        if response.startswith("ACCESS_NUMBER"):
-            parts = response.split(":")
-            new_id = parts[1]
-            new_number = parts[2]
+        parsed = _parse_access_number(response)
+        if parsed:
+            new_id, new_number = parsed
             
             # Notify readiness (status 1) as in the original snippet
             self.active_status(new_id)
             
-            return NumberActivation(
+            return NumberActivation.model_construct(
                 activation_id=new_id,
                 phone_number=new_number,
                 service="reactivation"
@@ -143,14 +277,7 @@ class ClientBase:
     def get_status(self, activation_id: str) -> ActivationStatus:
         """Get activation status and SMS code."""
         params = {"id": activation_id}
-        response = self._request("getStatus", params=params)
-        
-        # Expected: STATUS_WAIT_CODE, STATUS_OK:CODE, STATUS_CANCEL, etc.
-        if ":" in response:
-            status, code = response.split(":", 1)
-            return ActivationStatus(status=status, code=code)
-        
-        return ActivationStatus(status=response)
+        return _parse_status(self._request("getStatus", params=params))
 
     def get_sms(self, activation_id: str) -> Optional[str]:
         """
@@ -161,14 +288,11 @@ class ClientBase:
             timeout: Maximum wait time in seconds
             interval: Time between polls in seconds
         """
-        status = self.get_status(activation_id)
-        if status.status == "STATUS_OK":
-            return status.code
-        
-        # If status indicates it's finished or cancelled, stop polling
-        if status.status in ["STATUS_CANCEL", "NO_ACTIVATION", "ACCESS_CANCEL"]:
-            return None
-            
+        return _sms_code(self.get_status(activation_id))
+
+    def clear_cache(self) -> None:
+        """Drop all cached balance/price responses."""
+        self._cache.clear()
 
     def get_new_sms(self, activation_id: str, timeout: int = 60, interval: int = 5) -> Optional[str]:
         """
@@ -179,15 +303,43 @@ class ClientBase:
         self.set_status(activation_id, 3)
         return self.get_sms(activation_id, timeout=timeout, interval=interval)
 
+    def _slice_cached_prices(
+        self,
+        service: Optional[str],
+        country: Optional[int],
+        free_price: Optional[bool],
+        strict: bool,
+    ) -> Optional[List[CountryPricesLike]]:
+        """Per-service view of a still-fresh unfiltered get_prices() result, if any."""
+        if service is None or country is not None or free_price or strict:
+            return None
+        full = self._cache.get(ClientBase.get_prices.cache_key())
+        if not full:
+            return None
+        return [
+            FastCountryPrices(country_id=cp.country_id, services={service: cp.services[service]})
+            for cp in full
+            if service in cp.services
+        ]
+
+    @cached(ttl=NORMAL_TTL, derive=_slice_cached_prices)
     def get_prices(
         self, 
         service: Optional[str] = None, 
         country: Optional[int] = None,
-        free_price: Optional[bool] = False
-    ) -> List[CountryPrices]:
+        free_price: Optional[bool] = False,
+        strict: bool = False,
+    ) -> List[CountryPricesLike]:
         """
         Get prices for services.
         This usually returns a complex JSON.
+
+        Rows are slotted FastCountryPrices/FastServicePrice mirrors, not
+        pydantic models: they offer model_dump(), model_dump_json(),
+        model_copy() and to_pydantic(), but isinstance(row, CountryPrices)
+        is False. Pass ``strict=True`` to get validated pydantic models.
+        If an unfiltered get_prices() result is cached, a single service is
+        sliced from it instead of being downloaded again.
         """
         params = {}
         if service:
@@ -200,61 +352,110 @@ class ClientBase:
         # getPrices usually returns JSON even in the standard API
         response = self._request("getPrices", params=params)
         try:
-            import json
-            data = json.loads(response)
-
-            print(data)
-            
             result = []
-            
-            # Standardization: some APIs return a list with one dictionary
-            if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
-                data = data[0]
+            service_price = ServicePrice if strict else FastServicePrice
+            country_prices = CountryPrices if strict else FastCountryPrices
 
-            if isinstance(data, dict):
-                for country_id, services in data.items():
-                    if not isinstance(services, dict):
+            if (
+                service
+                and _ijson is not None
+                and len(response) > _STREAM_THRESHOLD
+                and response.startswith("{")
+            ):
+                # Stream big payloads country by country instead of building the whole tree
+                countries = _ijson.kvitems(io.BytesIO(response.encode()), "", use_float=True)
+            else:
+                data = _json.loads(response)
+
+                # Standardization: some APIs return a list with one dictionary
+                if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
+                    data = data[0]
+
+                countries = data.items() if isinstance(data, dict) else ()
+
+            if service:
+                # Keep only the requested service, whichever path parsed the payload
+                countries = (
+                    (country_id, {service: services[service]})
+                    for country_id, services in countries
+                    if isinstance(services, dict) and service in services
+                )
+
+            for country_id, services in countries:
+                if not isinstance(services, dict):
+                    continue
+                    
+                service_map = {}
+                for srv_code, srv_data in services.items():
+                    if not isinstance(srv_data, dict):
                         continue
                         
-                    service_map = {}
-                    for srv_code, srv_data in services.items():
-                        if not isinstance(srv_data, dict):
-                            continue
-                            
-                        # srv_data is usually {"cost": 0.5, "count": 10} or with freePriceMap
-                        base_cost = float(srv_data.get("cost", 0) or srv_data.get("price", 0))
-                        cost: Union[float, List[float]] = base_cost
-                        min_p = base_cost
-                        max_p = base_cost
-                        
-                        # Support for multiple prices if freePriceMap is present
-                        free_price_map = srv_data.get("freePriceMap")
-                        if isinstance(free_price_map, dict) and free_price_map:
-                            prices = sorted([float(p) for p in free_price_map.keys()])
-                            if prices:
-                                cost = prices
-                                min_p = prices[0]
-                                max_p = prices[-1]
-
-                        service_map[srv_code] = ServicePrice(
-                            service=srv_code,
-                            cost=cost,
-                            min_price=min_p,
-                            max_price=max_p,
-                            count=int(srv_data.get("count", 0) or 0)
-                        )
+                    # srv_data is usually {"cost": 0.5, "count": 10} or with freePriceMap
+                    base_cost = float(srv_data.get("cost", 0) or srv_data.get("price", 0))
+                    cost: Union[float, List[float]] = base_cost
+                    min_p = base_cost
+                    max_p = base_cost
                     
-                    if service_map:
-                        result.append(CountryPrices(country_id=int(country_id), services=service_map))
+                    # Support for multiple prices if freePriceMap is present (cost is sorted ascending)
+                    free_price_map = srv_data.get("freePriceMap")
+                    if isinstance(free_price_map, dict) and free_price_map:
+                        prices = sorted(map(float, free_price_map))
+                        cost = prices
+                        min_p = prices[0]
+                        max_p = prices[-1]
+
+                    service_map[srv_code] = service_price(
+                        service=srv_code,
+                        cost=cost,
+                        min_price=min_p,
+                        max_price=max_p,
+                        count=int(srv_data.get("count", 0) or 0)
+                    )
+                
+                if service_map:
+                    result.append(country_prices(country_id=int(country_id), services=service_map))
             return result
         except Exception:
             # If not JSON, we might need a different parser or it's an error
             raise ValueError(f"Error parsing prices or received error: {response}")
 
-    def get_top_countries_by_service(self, service: Optional[str] = None, free_price: Optional[bool] = False) -> List[CountryPrices]:
+    @staticmethod
+    def _iter_top_entries(data: Any, service: Optional[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (service_code, entry) pairs from a getTopCountriesByService payload.
+
+        With a service filter the payload is a List[dict] or a Dict[idx, dict],
+        optionally wrapped as {"service_code": ...}. Without it, it is a
+        List[Dict[srv, entries]] or a Dict[srv, entries], where entries is a
+        list or a dict indexed by "0", "1", ...
+        """
+        if service:
+            if isinstance(data, dict):
+                data = data.get(service, data)
+            groups = [(service, data)]
+        else:
+            items = data if isinstance(data, list) else [data]
+            groups = [pair for item in items if isinstance(item, dict) for pair in item.items()]
+
+        for srv_code, entries in groups:
+            if isinstance(entries, dict):
+                entries = entries.values()
+            elif not isinstance(entries, list):
+                continue
+            for entry in entries:
+                if isinstance(entry, dict):
+                    yield srv_code, entry
+
+    @cached(ttl=LONG_TTL)
+    def get_top_countries_by_service(self, service: Optional[str] = None, free_price: Optional[bool] = False, strict: bool = False) -> List[CountryPricesLike]:
         """
         Get top countries for a service or all services.
         Action: getTopCountriesByService
+
+        Rows are slotted FastCountryPrices/FastServicePrice mirrors, not
+        pydantic models: they offer model_dump(), model_dump_json(),
+        model_copy() and to_pydantic(), but isinstance(row, CountryPrices)
+        is False. Pass ``strict=True`` to get validated pydantic models.
         """
         params = {}
         if service:
@@ -265,35 +466,33 @@ class ClientBase:
             
         response = self._request("getTopCountriesByService", params=params)
         try:
-            import json
-            data = json.loads(response)
+            data = _json.loads(response)
             
             # Pivot data to List[CountryPrices]
-            country_map: Dict[int, Dict[str, ServicePrice]] = {}
+            country_map: Dict[int, Dict[str, Any]] = defaultdict(dict)
+            service_price = ServicePrice if strict else FastServicePrice
+            country_prices = CountryPrices if strict else FastCountryPrices
 
             def process_entry(srv_code: str, entry: Dict[str, Any]):
                 c_id = entry.get("country")
                 if c_id is None:
                     return
                 c_id = int(c_id)
-                if c_id not in country_map:
-                    country_map[c_id] = {}
                 
                 base_cost = float(entry.get("price", 0) or entry.get("cost", 0) or 0)
                 cost: Union[float, List[float]] = base_cost
                 min_p = base_cost
                 max_p = base_cost
                 
-                # Support for multiple prices if freePriceMap is present
+                # Support for multiple prices if freePriceMap is present (cost is sorted ascending)
                 free_price_map = entry.get("freePriceMap")
                 if isinstance(free_price_map, dict) and free_price_map:
-                    prices = sorted([float(p) for p in free_price_map.keys()])
-                    if prices:
-                        cost = prices
-                        min_p = prices[0]
-                        max_p = prices[-1]
+                    prices = sorted(map(float, free_price_map))
+                    cost = prices
+                    min_p = prices[0]
+                    max_p = prices[-1]
 
-                country_map[c_id][srv_code] = ServicePrice(
+                country_map[c_id][srv_code] = service_price(
                     service=srv_code,
                     cost=cost,
                     min_price=min_p,
@@ -301,43 +500,9 @@ class ClientBase:
                     count=int(entry.get("count", 0) or 0)
                 )
 
-            if service:
-                # Can be a List[dict] or a Dict[str, dict] (indexed by "0", "1", ...)
-                entries = data
-                if isinstance(data, dict):
-                    # Handle if the API returns {"service_code": {...}} even when service is requested
-                    if service in data:
-                        entries = data[service]
-                    
-                if isinstance(entries, list):
-                    for entry in entries:
-                        if isinstance(entry, dict):
-                            process_entry(service, entry)
-                elif isinstance(entries, dict):
-                    for entry in entries.values():
-                        if isinstance(entry, dict):
-                            process_entry(service, entry)
-            else:
-                # Can be List[Dict[srv, List[dict]]] or Dict[srv, Dict[idx, dict]]
-                if isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict):
-                            for srv_code, entries in item.items():
-                                if isinstance(entries, list):
-                                    for entry in entries:
-                                        process_entry(srv_code, entry)
-                                elif isinstance(entries, dict):
-                                    for entry in entries.values():
-                                        process_entry(srv_code, entry)
-                elif isinstance(data, dict):
-                    for srv_code, entries in data.items():
-                        if isinstance(entries, list):
-                            for entry in entries:
-                                process_entry(srv_code, entry)
-                        elif isinstance(entries, dict):
-                            for entry in entries.values():
-                                process_entry(srv_code, entry)
+            for srv_code, entry in self._iter_top_entries(data, service):
+                process_entry(srv_code, entry)
             
-            return [CountryPrices(country_id=cid, services=srvs) for cid, srvs in country_map.items()]
+            return [country_prices(country_id=cid, services=srvs) for cid, srvs in country_map.items()]
         except Exception as e:
             raise ValueError(f"Error parsing top countries: {response[:200]}... Internal error: {str(e)}")
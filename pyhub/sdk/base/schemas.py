@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Union
+from typing import Any, Optional, List, Dict, Union
 
 
 class Balance(BaseModel):
@@ -27,7 +27,17 @@ class ServicePrice(BaseModel):
     max_price: float
     count: int
 
+    @classmethod
+    def from_fast(cls, fast: Any) -> "ServicePrice":
+        """Validate a FastServicePrice (or any object with the same attributes)."""
+        return cls.model_validate(fast, from_attributes=True)
+
 
 class CountryPrices(BaseModel):
     country_id: int
     services: Dict[str, ServicePrice]
+
+    @classmethod
+    def from_fast(cls, fast: Any) -> "CountryPrices":
+        """Validate a FastCountryPrices (or any object with the same attributes)."""
+        return cls.model_validate(fast, from_attributes=True)
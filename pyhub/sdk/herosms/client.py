@@ -1,6 +1,6 @@
 from typing import Optional, List
 from pyhub.sdk.base.client import ClientBase
-from pyhub.sdk.base.schemas import CountryPrices
+from pyhub.sdk.base._fast_schemas import CountryPricesLike
 
 
 class HeroSMSClient(ClientBase):
@@ -24,14 +24,15 @@ class HeroSMSClient(ClientBase):
         )
         
 
-    def get_prices(self, service: Optional[str] = None, country: Optional[int] = None,free_price: Optional[bool] = True) -> List[CountryPrices]:
+    def get_prices(self, service: Optional[str] = None, country: Optional[int] = None,free_price: Optional[bool] = True, strict: bool = False) -> List[CountryPricesLike]:
         """
         Overrides get_prices to use getTopCountriesByService for HeroSMS,
         as it provides more detailed data including country mapping.
+        Like ClientBase.get_prices, rows are Fast* mirrors unless ``strict``.
         """
 
         # if not country:
-        results = self.get_top_countries_by_service(service=service,free_price=free_price)
+        results = self.get_top_countries_by_service(service=service,free_price=free_price,strict=strict)
     
         if country is not None:
             return [r for r in results if r.country_id == country]
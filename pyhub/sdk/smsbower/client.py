@@ -1,6 +1,14 @@
 from typing import Optional, List, Dict, Any
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 from pyhub.sdk.base.client import ClientBase
+from pyhub.sdk.base.cache import cached, NORMAL_TTL
 from pyhub.sdk.base.schemas import CountryPrices, ServicePrice
+from pyhub.sdk.base._fast_schemas import FastServicePrice, FastCountryPrices, CountryPricesLike
 
 
 class SMSBowerClient(ClientBase):
@@ -26,15 +34,18 @@ class SMSBowerClient(ClientBase):
         self, 
         service: Optional[str] = None, 
         country: Optional[int] = None,
-        free_price: Optional[bool] = False
-    ) -> List[CountryPrices]:
+        free_price: Optional[bool] = False,
+        strict: bool = False,
+    ) -> List[CountryPricesLike]:
         """
         Overrides get_prices to use get_prices_v2 for SMSBower,
         as it provides more detailed data.
+        Like ClientBase.get_prices, rows are Fast* mirrors unless ``strict``.
         """
-        return self.get_prices_v2(service=service, country=country)
+        return self.get_prices_v2(service=service, country=country, strict=strict)
 
-    def get_prices_v2(self, service: Optional[str] = None, country: Optional[int] = None) -> List[CountryPrices]:
+    @cached(ttl=NORMAL_TTL)
+    def get_prices_v2(self, service: Optional[str] = None, country: Optional[int] = None, strict: bool = False) -> List[CountryPricesLike]:
         """
         Get prices for services (V2).
         Returns multiple prices per service.
@@ -47,13 +58,13 @@ class SMSBowerClient(ClientBase):
 
         response = self._request("getPricesV2", params=params)
         try:
-            import json
-            data = json.loads(response)
-            return self._parse_complex_prices(data, version="v2")
+            data = _json.loads(response)
+            return self._parse_complex_prices(data, version="v2", strict=strict)
         except Exception as e:
             raise ValueError(f"Error parsing prices V2: {response[:200]}... Internal error: {str(e)}")
 
-    def get_prices_v3(self, service: Optional[str] = None, country: Optional[int] = None) -> List[CountryPrices]:
+    @cached(ttl=NORMAL_TTL)
+    def get_prices_v3(self, service: Optional[str] = None, country: Optional[int] = None, strict: bool = False) -> List[CountryPricesLike]:
         """
         Get prices for services (V3).
         Returns provider-specific data.
@@ -66,37 +77,32 @@ class SMSBowerClient(ClientBase):
 
         response = self._request("getPricesV3", params=params)
         try:
-            import json
-            data = json.loads(response)
-            return self._parse_complex_prices(data, version="v3")
+            data = _json.loads(response)
+            return self._parse_complex_prices(data, version="v3", strict=strict)
         except Exception as e:
             raise ValueError(f"Error parsing prices V3: {response[:200]}... Internal error: {str(e)}")
 
-    def _parse_complex_prices(self, data: Dict[str, Any], version: str) -> List[CountryPrices]:
+    def _parse_complex_prices(self, data: Dict[str, Any], version: str, strict: bool = False) -> List[CountryPricesLike]:
         """ Helper to parse V2 and V3 structures into standardized CountryPrices. """
         result = []
+        # Values are already coerced with float()/int(), so validation is opt-in
+        service_price = ServicePrice if strict else FastServicePrice
+        country_prices = CountryPrices if strict else FastCountryPrices
         for country_id, services in data.items():
             service_map = {}
             for srv_code, srv_data in services.items():
-                prices = []
-                total_count = 0
-                
                 if version == "v2":
                     # format: {"price1": count, "price2": count}
-                    for price_str, count in srv_data.items():
-                        p = float(price_str)
-                        prices.append(p)
-                        total_count += int(count)
+                    prices = sorted(map(float, srv_data))
+                    total_count = sum(map(int, srv_data.values()))
                 else:
                     # version v3 format: {"provider_id": {"price": price, "count": count}}
-                    for provider_data in srv_data.values():
-                        p = float(provider_data.get("price", 0))
-                        prices.append(p)
-                        total_count += int(provider_data.get("count", 0))
+                    providers = srv_data.values()
+                    prices = sorted(float(d.get("price", 0)) for d in providers)
+                    total_count = sum(int(d.get("count", 0)) for d in providers)
 
                 if prices:
-                    prices.sort()
-                    service_map[srv_code] = ServicePrice(
+                    service_map[srv_code] = service_price(
                         service=srv_code,
                         cost=prices if len(prices) > 1 else prices[0],
                         min_price=prices[0],
@@ -105,6 +111,6 @@ class SMSBowerClient(ClientBase):
                     )
             
             if service_map:
-                result.append(CountryPrices(country_id=int(country_id), services=service_map))
+                result.append(country_prices(country_id=int(country_id), services=service_map))
         
         return result
@@ -1,22 +1,34 @@
+import asyncio
+import threading
+import time
+import httpx
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from pyhub.sdk.api import PyHub
-from pyhub.sdk.base.schemas import Balance, NumberActivation, ActivationStatus, CountryPrices
+from pyhub.sdk.base.cache import SHORT_TTL
+from pyhub.sdk.base.schemas import Balance, NumberActivation, ActivationStatus, CountryPrices, ServicePrice
+
+@pytest.fixture(autouse=True)
+def clear_clients():
+    PyHub.clear_clients()
+    yield
+    PyHub.clear_clients()
 
 @pytest.fixture
 def mock_httpx():
     with patch("httpx.Client") as mock:
-        client_instance = mock.return_value.__enter__.return_value
+        client_instance = mock.return_value
+        client_instance.is_closed = False
         yield client_instance
 
 def test_pyhub_factory():
-    client = PyHub.get_client(provider="smshub", api_key="test_key")
     from pyhub.sdk.smshub import SMSHubClient
-    assert isinstance(client, SMSHubClient)
+    with PyHub.get_client(provider="smshub", api_key="test_key") as client:
+        assert isinstance(client, SMSHubClient)
     
-    client = PyHub.get_client(base_url="https://hero-sms.com/stubs/handler_api.php", api_key="test_key")
     from pyhub.sdk.herosms import HeroSMSClient
-    assert isinstance(client, HeroSMSClient)
+    with PyHub.get_client(base_url="https://hero-sms.com/stubs/handler_api.php", api_key="test_key") as client:
+        assert isinstance(client, HeroSMSClient)
 
 def test_get_balance(mock_httpx):
     mock_httpx.get.return_value.text = "ACCESS_BALANCE:100.50"
@@ -126,3 +138,403 @@ def test_api_error_handling(mock_httpx):
     client = PyHub.get_client(provider="smshub", api_key="wrong_key")
     with pytest.raises(ValueError, match="API Error: BAD_KEY"):
         client.get_balance()
+
+def test_client_reuses_connection(mock_httpx):
+    mock_httpx.get.return_value.text = "STATUS_WAIT_CODE"
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    with PyHub.get_client(provider="smshub", api_key="test_key") as client:
+        client.get_status("1")
+        client.get_status("2")
+
+    assert mock_httpx.get.call_count == 2
+    mock_httpx.close.assert_called_once()
+
+def test_async_get_status_many():
+    from pyhub.sdk.base.async_client import AsyncClientBase
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_get(url, params=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Yield so that every request the semaphore admits is in flight together
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        response = MagicMock()
+        response.text = f"STATUS_OK:{params['id']}"
+        return response
+
+    async def run():
+        with patch("httpx.AsyncClient") as mock:
+            mock.return_value.get.side_effect = fake_get
+            mock.return_value.aclose = AsyncMock()
+            async with AsyncClientBase(
+                api_key="test_key",
+                base_url="https://smshub.org/stubs/handler_api.php",
+                max_concurrency=2,
+            ) as client:
+                return await client.get_status_many([str(i) for i in range(5)])
+
+    statuses = asyncio.run(run())
+
+    assert [s.code for s in statuses] == ["0", "1", "2", "3", "4"]
+    assert all(s.status == "STATUS_OK" for s in statuses)
+    # Requests overlap, but never beyond max_concurrency
+    assert peak == 2
+
+def test_get_prices_cached(mock_httpx):
+    mock_httpx.get.return_value.text = '{"0": {"tg": {"cost": 10.5, "count": 100}}}'
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    first = client.get_prices(service="tg")
+    second = client.get_prices(service="tg")
+
+    assert first == second
+    mock_httpx.get.assert_called_once()
+
+    client.get_prices(service="wa")
+    assert mock_httpx.get.call_count == 2
+
+def test_cache_stale_fallback(mock_httpx):
+    mock_httpx.get.return_value.text = "ACCESS_BALANCE:100.50"
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    client.get_balance()
+    mock_httpx.get.side_effect = httpx.ConnectError("down")
+    now = time.monotonic()
+
+    # Expired 1s ago: within the default stale window (3 * ttl)
+    with patch("pyhub.sdk.base.cache.time.monotonic", return_value=now + SHORT_TTL + 1):
+        assert client.get_balance().amount == 100.50
+
+    # Expired long ago: the error is raised instead of serving stale data
+    with patch("pyhub.sdk.base.cache.time.monotonic", return_value=now + 10 * SHORT_TTL):
+        with pytest.raises(httpx.ConnectError):
+            client.get_balance()
+
+def test_cached_results_are_copies(mock_httpx):
+    mock_httpx.get.return_value.text = '{"0": {"tg": {"cost": 10.5, "count": 100}}}'
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    client.get_prices(service="tg").clear()
+
+    assert len(client.get_prices(service="tg")) == 1
+    mock_httpx.get.assert_called_once()
+
+def test_api_error_with_details(mock_httpx):
+    mock_httpx.get.return_value.text = "BANNED:'2026-01-01 10-00-00'"
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    with pytest.raises(ValueError, match="API Error: BANNED"):
+        client.get_status("12345")
+
+def test_pyhub_factory_normalization():
+    from pyhub.sdk.smsactivate import SMSActivateClient
+    from pyhub.sdk.smsbower import SMSBowerClient
+
+    with PyHub.get_client(provider=" SMS-Activate ", api_key="test_key") as client:
+        assert isinstance(client, SMSActivateClient)
+    with PyHub.get_client(provider="sms_bower", api_key="test_key") as client:
+        assert isinstance(client, SMSBowerClient)
+
+    with PyHub.get_client(base_url="https://SMSBOWER.page/stubs/handler_api.php", api_key="test_key") as client:
+        assert isinstance(client, SMSBowerClient)
+
+def test_pyhub_factory_memoized(mock_httpx):
+    first = PyHub.get_client(provider="smshub", api_key="test_key")
+    assert PyHub.get_client(provider="smshub", api_key="test_key") is first
+    assert PyHub.get_client(provider="smshub", api_key="other_key") is not first
+
+    mock_httpx.is_closed = True
+    assert PyHub.get_client(provider="smshub", api_key="test_key") is not first
+
+def test_get_prices_strict(mock_httpx):
+    mock_httpx.get.return_value.text = '{"0": {"tg": {"cost": 10.5, "count": 100}}}'
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    fast = client.get_prices(service="tg")
+    strict = client.get_prices(service="tg", strict=True)
+
+    assert fast[0].services["tg"].model_dump() == strict[0].services["tg"].model_dump()
+    assert isinstance(strict[0].services["tg"], ServicePrice)
+
+def test_get_top_countries_all_services_list(mock_httpx):
+    mock_httpx.get.return_value.text = (
+        '[{"tg": [{"country": 0, "price": 10.0, "count": 100}, {"country": 6, "price": 12.0, "count": 5}],'
+        ' "wa": {"0": {"country": 0, "price": 20.0, "count": 3, "freePriceMap": {"21.5": 1, "20.5": 2}}}}]'
+    )
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    prices = {cp.country_id: cp for cp in client.get_top_countries_by_service()}
+
+    assert set(prices) == {0, 6}
+    assert set(prices[0].services) == {"tg", "wa"}
+    assert prices[0].services["wa"].cost == [20.5, 21.5]
+    assert prices[6].services["tg"].count == 5
+
+def test_get_sms_terminal_status(mock_httpx):
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+
+    mock_httpx.get.return_value.text = "STATUS_OK:4321"
+    assert client.get_sms("12345") == "4321"
+
+    mock_httpx.get.return_value.text = "STATUS_CANCEL"
+    assert client.get_sms("12345") is None
+
+def test_get_prices_streaming(mock_httpx):
+    pytest.importorskip("ijson")
+    mock_httpx.get.return_value.text = (
+        '{"0": {"tg": {"cost": 10.5, "count": 100}, "wa": {"cost": 3.0, "count": 1}},'
+        ' "6": {"wa": {"cost": 4.0, "count": 2}}}'
+    )
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    with patch("pyhub.sdk.base.client._STREAM_THRESHOLD", 0):
+        prices = client.get_prices(service="tg")
+
+    assert len(prices) == 1
+    assert prices[0].country_id == 0
+    assert list(prices[0].services) == ["tg"]
+    assert prices[0].services["tg"].cost == 10.5
+
+def test_get_prices_service_slice_from_cache(mock_httpx):
+    mock_httpx.get.return_value.text = (
+        '{"0": {"tg": {"cost": 10.5, "count": 100}, "wa": {"cost": 3.0, "count": 1}},'
+        ' "6": {"wa": {"cost": 4.0, "count": 2}}}'
+    )
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    client.get_prices()
+    wa = client.get_prices(service="wa")
+    tg = client.get_prices(service="tg")
+
+    mock_httpx.get.assert_called_once()
+    assert [cp.country_id for cp in wa] == [0, 6]
+    assert all(list(cp.services) == ["wa"] for cp in wa)
+    assert len(tg) == 1 and tg[0].services["tg"].cost == 10.5
+
+def test_pyhub_factory_unknown_url():
+    with pytest.raises(ValueError, match="Unknown provider URL"):
+        PyHub.get_client(base_url="https://example.com/stubs/handler_api.php", api_key="test_key")
+
+    # An explicit provider still accepts a custom URL
+    with PyHub.get_client(provider="smshub", base_url="https://example.com/stubs/handler_api.php", api_key="test_key") as client:
+        assert client.base_url == "https://example.com/stubs/handler_api.php"
+
+def test_request_uses_parsed_url(mock_httpx):
+    mock_httpx.get.return_value.text = "STATUS_WAIT_CODE"
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    client.get_status("12345")
+
+    url = mock_httpx.get.call_args.args[0]
+    assert isinstance(url, httpx.URL)
+    assert url == httpx.URL("https://smshub.org/stubs/handler_api.php")
+    assert mock_httpx.get.call_args.kwargs["params"] == {"api_key": "test_key", "action": "getStatus", "id": "12345"}
+
+def test_fast_prices_to_pydantic(mock_httpx):
+    from pyhub.sdk.base._fast_schemas import FastCountryPrices
+
+    mock_httpx.get.return_value.text = '{"0": {"tg": {"10.5": 100, "15.0": 50}}}'
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smsbower", api_key="test_key")
+    fast = client.get_prices_v2(service="tg")[0]
+    assert isinstance(fast, FastCountryPrices)
+
+    model = fast.to_pydantic()
+    assert isinstance(model, CountryPrices)
+    assert isinstance(model.services["tg"], ServicePrice)
+    assert model.model_dump() == fast.model_dump()
+
+def test_client_enables_http2():
+    with patch("httpx.Client") as mock:
+        PyHub.get_client(provider="smshub", api_key="test_key")
+
+    kwargs = mock.call_args.kwargs
+    assert kwargs["http2"] is True
+    assert kwargs["limits"] == httpx.Limits(max_keepalive_connections=20, max_connections=20, keepalive_expiry=30.0)
+
+def test_pyhub_factory_shared_close():
+    a1 = PyHub.get_client(provider="smshub", api_key="A")
+    b = PyHub.get_client(provider="smshub", api_key="B")
+
+    with PyHub.get_client(provider="smshub", api_key="A") as a2:
+        assert a2 is a1
+    # The other holder of "A" keeps a usable client
+    assert not a1.closed
+
+    a1.close()
+    assert a1.closed
+
+    a3 = PyHub.get_client(provider="smshub", api_key="A")
+    assert a3 is not a1 and not a3.closed
+    # Rebuilding "A" does not drop the memoized "B" client
+    assert PyHub.get_client(provider="smshub", api_key="B") is b
+
+    a3.close()
+    b.close()
+    b.close()
+    assert a3.closed and b.closed
+
+def test_pyhub_factory_eviction_keeps_client_usable(mock_httpx, monkeypatch):
+    monkeypatch.setattr(PyHub, "_max_clients", 1)
+    mock_httpx.get.return_value.text = "STATUS_WAIT_CODE"
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    first = PyHub.get_client(provider="smshub", api_key="A")
+    PyHub.get_client(provider="smshub", api_key="B")
+
+    # Evicted from the memo, but its holder can keep using it
+    mock_httpx.close.assert_not_called()
+    assert first.get_status("1").status == "STATUS_WAIT_CODE"
+
+    # The evicted key is rebuilt on the next lookup
+    assert PyHub.get_client(provider="smshub", api_key="A") is not first
+
+@pytest.mark.parametrize("payload", [
+    '{"0": {"tg": {"cost": 10.5, "count": 100}, "wa": {"cost": 3.0, "count": 1}}, "6": {"wa": {"cost": 4.0, "count": 2}}}',
+    '[{"0": {"tg": {"cost": 10.5, "count": 100}}}, {"6": {"tg": {"cost": 9.0, "count": 2}}}]',
+])
+def test_get_prices_streaming_matches_json(mock_httpx, payload):
+    pytest.importorskip("ijson")
+    mock_httpx.get.return_value.text = payload
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    parsed = client.get_prices(service="tg")
+    client.clear_cache()
+    with patch("pyhub.sdk.base.client._STREAM_THRESHOLD", 0):
+        streamed = client.get_prices(service="tg")
+
+    assert [cp.model_dump() for cp in streamed] == [cp.model_dump() for cp in parsed]
+    assert [cp.country_id for cp in parsed] == [0]
+
+def test_fast_prices_pydantic_compat(mock_httpx):
+    mock_httpx.get.return_value.text = '{"0": {"tg": {"cost": 10.5, "count": 100}}}'
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    fast = client.get_prices(service="tg")[0]
+    strict = client.get_prices(service="tg", strict=True)[0]
+
+    assert fast.model_dump_json() == strict.model_dump_json()
+    assert fast.model_dump(exclude={"country_id"}) == strict.model_dump(exclude={"country_id"})
+
+    copied = fast.model_copy(update={"country_id": 6}, deep=True)
+    assert copied.country_id == 6 and fast.country_id == 0
+    copied.services["tg"].count = 1
+    assert fast.services["tg"].count == 100
+
+def test_pyhub_factory_thread_safe(mock_httpx, monkeypatch):
+    monkeypatch.setattr(PyHub, "_max_clients", 2)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(200):
+                client = PyHub.get_client(provider="smshub", api_key=f"key-{(n + i) % 4}")
+                client.close()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+def test_ttl_cache_thread_safe():
+    from pyhub.sdk.base.cache import TTLCache
+
+    cache = TTLCache(4)
+    errors = []
+
+    def writer(offset):
+        try:
+            for i in range(2000):
+                cache.set(offset + i % 8, i, ttl=60)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    def reader():
+        try:
+            for i in range(2000):
+                cache.get(i % 16)
+                cache.get_stale(i % 16)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n * 8,)) for n in range(2)]
+    threads += [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(cache) <= 4
+
+def test_balance_refreshed_after_spending(mock_httpx):
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+
+    mock_httpx.get.return_value.text = "ACCESS_BALANCE:100.50"
+    assert client.get_balance().amount == 100.50
+
+    mock_httpx.get.return_value.text = "ACCESS_NUMBER:12345:79991234567"
+    client.get_number(service="tg", country=0)
+
+    mock_httpx.get.return_value.text = "ACCESS_BALANCE:90.50"
+    assert client.get_balance().amount == 90.50
+
+    mock_httpx.get.return_value.text = "ACCESS_CANCEL"
+    client.set_status("12345", 8)
+
+    mock_httpx.get.return_value.text = "ACCESS_BALANCE:100.50"
+    assert client.get_balance().amount == 100.50
+
+def test_cache_key_normalizes_arguments(mock_httpx):
+    from pyhub.sdk.base.client import ClientBase
+
+    key = ClientBase.get_prices.cache_key()
+    assert ClientBase.get_prices.cache_key(None) == key
+    assert ClientBase.get_prices.cache_key(free_price=False) == key
+    assert ClientBase.get_prices.cache_key(service="tg") != key
+
+    mock_httpx.get.return_value.text = '{"0": {"tg": {"cost": 10.5, "count": 100}, "wa": {"cost": 3.0, "count": 1}}}'
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    client.get_prices(free_price=False)
+    client.get_prices(None)
+    assert len(client.get_prices(service="wa")) == 1
+    mock_httpx.get.assert_called_once()
+
+def test_price_slice_not_cached_beyond_parent(mock_httpx):
+    from pyhub.sdk.base.client import ClientBase
+
+    mock_httpx.get.return_value.text = '{"0": {"tg": {"cost": 10.5, "count": 100}}}'
+    mock_httpx.get.return_value.raise_for_status = MagicMock()
+
+    client = PyHub.get_client(provider="smshub", api_key="test_key")
+    client.get_prices()
+    client.get_prices(service="tg")
+
+    assert client._cache.get(ClientBase.get_prices.cache_key(service="tg")) is None
+    mock_httpx.get.assert_called_once()